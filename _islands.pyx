@@ -0,0 +1,130 @@
+# cython: language_level=3
+"""
+Compiled island search for bad_pixels.py.
+
+Build it in place with `python setup.py build_ext --inplace`; bad_pixels.py uses it
+automatically when it can be imported.
+"""
+import numpy as np
+cimport cython
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef find_islands_c(const unsigned char[:, ::1] arr):
+    """
+    Finds pixel islands with an iterative depth-first search, a C version of
+    `bad_pixels._islands_kernel` with the same inputs and outputs.
+
+    Labelling, perimeter detection and coordinate extraction all happen in the same single
+    traversal: each pixel is written straight to the (N, 2) int32 output arrays the islands use.
+    The stack holds flat indices `x * W + y`.
+
+    Steps:
+    1. Preallocate the `labels` array (0 means unlabelled), the stack and the output arrays.
+    2. Iterate through each pixel in the image in raster order.
+    3. For each unlabelled pixel with a value less than 1, start a new island:
+       a. Label the pixel and push it onto the stack (pixels are labelled when pushed,
+          so each pixel enters the stack at most once).
+       b. While the stack is not empty, pop a pixel and append its (x, y) coordinates to `pixels`.
+       c. Check its 4 neighbours, written out one after the other rather than as a loop over
+          directions: an out-of-bounds neighbour or one with a value greater than
+          or equal to 1 makes the pixel a perimeter pixel; an unlabelled dark neighbour is
+          labelled and pushed.
+       d. Append perimeter pixels to `perimeter`.
+       e. Record where the island ends in `pixels` and `perimeter` in the offset arrays.
+    4. Return the used part of the pixel and perimeter arrays and their offsets.
+    """
+    cdef Py_ssize_t H = arr.shape[0]
+    cdef Py_ssize_t W = arr.shape[1]
+    # With 4-connectivity there are at most ceil(H * W / 2) islands
+    cdef Py_ssize_t max_islands = (H * W + 1) // 2
+
+    labels_arr = np.zeros((H, W), dtype=np.int32)
+    stack_arr = np.empty(H * W, dtype=np.int64)
+    pixels_arr = np.empty((H * W, 2), dtype=np.int32)
+    perimeter_arr = np.empty((H * W, 2), dtype=np.int32)
+    pixel_offsets_arr = np.zeros(max_islands + 1, dtype=np.int64)
+    perim_offsets_arr = np.zeros(max_islands + 1, dtype=np.int64)
+
+    cdef int[:, ::1] labels = labels_arr
+    cdef long long[::1] stack = stack_arr
+    cdef int[:, ::1] pixels = pixels_arr
+    cdef int[:, ::1] perimeter = perimeter_arr
+    cdef long long[::1] pixel_offsets = pixel_offsets_arr
+    cdef long long[::1] perim_offsets = perim_offsets_arr
+
+    cdef int n = 0
+    cdef Py_ssize_t num_pixels = 0
+    cdef Py_ssize_t num_perimeter = 0
+    cdef Py_ssize_t sp, i, j, cx, cy
+    cdef long long idx
+    cdef bint is_perimeter
+
+    for i in range(H):
+        for j in range(W):
+            if labels[i, j] != 0 or arr[i, j] >= 1:
+                continue
+            n += 1
+            labels[i, j] = n
+            stack[0] = i * W + j
+            sp = 1
+            while sp > 0:
+                sp -= 1
+                idx = stack[sp]
+                cx = idx // W
+                cy = idx - cx * W
+                pixels[num_pixels, 0] = cx
+                pixels[num_pixels, 1] = cy
+                num_pixels += 1
+
+                is_perimeter = False
+                # Up
+                if cx > 0:
+                    if arr[cx - 1, cy] >= 1:
+                        is_perimeter = True
+                    elif labels[cx - 1, cy] == 0:
+                        labels[cx - 1, cy] = n
+                        stack[sp] = idx - W
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Down
+                if cx < H - 1:
+                    if arr[cx + 1, cy] >= 1:
+                        is_perimeter = True
+                    elif labels[cx + 1, cy] == 0:
+                        labels[cx + 1, cy] = n
+                        stack[sp] = idx + W
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Left
+                if cy > 0:
+                    if arr[cx, cy - 1] >= 1:
+                        is_perimeter = True
+                    elif labels[cx, cy - 1] == 0:
+                        labels[cx, cy - 1] = n
+                        stack[sp] = idx - 1
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Right
+                if cy < W - 1:
+                    if arr[cx, cy + 1] >= 1:
+                        is_perimeter = True
+                    elif labels[cx, cy + 1] == 0:
+                        labels[cx, cy + 1] = n
+                        stack[sp] = idx + 1
+                        sp += 1
+                else:
+                    is_perimeter = True
+
+                if is_perimeter:
+                    perimeter[num_perimeter, 0] = cx
+                    perimeter[num_perimeter, 1] = cy
+                    num_perimeter += 1
+            pixel_offsets[n] = num_pixels
+            perim_offsets[n] = num_perimeter
+
+    return (pixels_arr[:num_pixels], pixel_offsets_arr[:n + 1],
+            perimeter_arr[:num_perimeter], perim_offsets_arr[:n + 1])
@@ -1,84 +1,405 @@
 import argparse
 import os
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from PIL import Image
 
-def find_islands(image):
+try:
+    from _islands import find_islands_c
+except ImportError:  # The Cython extension is optional, see setup.py
+    find_islands_c = None
+
+try:
+    from scipy.ndimage import label
+except ImportError:  # SciPy is optional, fall back to the pure-Python search
+    label = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, `_islands_kernel` then runs as plain Python
+    njit = None
+
+# 4-connectivity (up, down, left, right), used when labelling islands
+_STRUCTURE = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]])
+
+# Largest fraction of dark pixels for which islands are found by union-find on the dark pixels only
+_SPARSE_FRACTION = 0.05
+
+# Data rows per Excel sheet (1048576 rows, minus the header row)
+_EXCEL_MAX_ROWS = 1048575
+
+def find_islands(arr):
     """
     Identifies pixel islands in a grayscale image.
     
+    Each island is a dict whose 'pixels' and 'perimeter' entries are (N, 2) int32 arrays of
+    (x, y) coordinates, where x is the row and y the column.
+    
     Steps:
-    1. Initialize an empty set `visited` to keep track of visited pixels.
-    2. Initialize an empty list `islands` to store the information of identified islands.
-    3. Iterate through each pixel in the image.
-    4. For each pixel that hasn't been visited and has a value less than 1:
-       a. Initialize an empty list `island` to store the coordinates of the island's pixels.
-       b. Initialize an empty list `perimeter` to store the coordinates of the island's perimeter pixels.
-       c. Call `dfs` to perform depth-first search starting from this pixel to find the entire island.
-       d. Append the island's information (pixels and perimeter) to the `islands` list.
-    5. Return the `islands` list.
-    """
-    def dfs(x, y, visited, image, island, perimeter):
-        """
-        Performs depth-first search to identify all connected pixels in an island.
-        
-        Steps:
-        1. Initialize a stack with the starting pixel (x, y).
-        2. Get the value of the starting pixel.
-        3. Define the directions for moving up, down, left, and right.
-        4. While the stack is not empty:
-           a. Pop the top pixel (cx, cy) from the stack.
-           b. If this pixel has not been visited:
-              i. Mark it as visited.
-              ii. Add it to the `island` list.
-              iii. Initialize a flag `is_perimeter` to determine if the pixel is a perimeter pixel.
-              iv. For each direction (dx, dy):
-                  A. Calculate the new coordinates (nx, ny).
-                  B. Check if the new coordinates are within the image bounds.
-                  C. If the pixel (nx, ny) has not been visited:
-                     - If the pixel value is different or greater than or equal to 1, mark `is_perimeter` as True.
-                     - If the pixel value is the same, add it to the stack for further exploration.
-                  D. If the new coordinates are out of bounds, mark `is_perimeter` as True.
-              v. If `is_perimeter` is True, add the pixel to the `perimeter` list.
-        """
-        stack = [(x, y)]
-        pixel_value = image[x][y]
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, down, left, right
+    1. If Numba is available and at most `_SPARSE_FRACTION` of the pixels have a value less
+       than 1, use `_find_islands_sparse`, which only looks at those pixels.
+    2. Else, if the Cython extension `_islands` has been built, use its `find_islands_c`.
+       Otherwise, if SciPy is not available, fall back to the compiled `_islands_kernel` when
+       Numba is available, or to `_find_islands_dfs` otherwise.
+    3. Build a boolean mask of the pixels with a value less than 1.
+    4. Label the 4-connected components of the mask with `scipy.ndimage.label`.
+    5. Build the perimeter mask using `_perimeter_mask`.
+    6. Convert the label and perimeter arrays to the list of islands using `_islands_from_labels`.
+    7. Return the `islands` list.
+    """
+    if njit is not None:
+        dark = np.flatnonzero(arr < 1)
+        if len(dark) <= _SPARSE_FRACTION * arr.size:
+            return _find_islands_sparse(dark, arr.shape[1])
+    if find_islands_c is not None:
+        return _islands_from_offsets(*find_islands_c(np.ascontiguousarray(arr)))
+    if label is None:
+        if njit is not None:
+            return _islands_from_offsets(*_islands_kernel(np.ascontiguousarray(arr)))
+        return _find_islands_dfs(arr)
 
-        while stack:
-            cx, cy = stack.pop()
-            if (cx, cy) not in visited:
-                visited.add((cx, cy))
-                island.append((cx, cy))
+    mask = arr < 1
+    lbl, n = label(mask, structure=_STRUCTURE)
+    return _islands_from_labels(lbl, n, _perimeter_mask(mask))
+
+def _perimeter_mask(mask):
+    """
+    Finds the perimeter pixels of a mask without branching on each pixel.
+    
+    Steps:
+    1. Shift the mask by one pixel in each of the 4 directions, filling with False, so that each
+       shifted array holds whether the neighbour above, below, left or right is in the mask.
+       Neighbours outside the image are never in the mask.
+    2. Return the mask pixels that have at least one neighbour outside the mask.
+    """
+    up = np.zeros_like(mask)
+    up[1:] = mask[:-1]
+    down = np.zeros_like(mask)
+    down[:-1] = mask[1:]
+    left = np.zeros_like(mask)
+    left[:, 1:] = mask[:, :-1]
+    right = np.zeros_like(mask)
+    right[:, :-1] = mask[:, 1:]
+    return mask & ~(up & down & left & right)
+
+def _islands_from_labels(lbl, n, perim_mask):
+    """
+    Groups the pixels of a label array into islands.
+    
+    Steps:
+    1. Bucket the coordinates of all labelled pixels by label using `_group_by_label`.
+    2. Bucket the coordinates of the perimeter pixels by label the same way.
+    3. Build one island per label from the two buckets and return the list of islands.
+    """
+    if n == 0:
+        return []
+
+    rows, cols = np.nonzero(lbl)
+    pixels = _group_by_label(lbl[rows, cols], n, rows, cols)
+    rows, cols = np.nonzero(perim_mask)
+    perimeters = _group_by_label(lbl[rows, cols], n, rows, cols)
+    return [{'pixels': p, 'perimeter': q} for p, q in zip(pixels, perimeters)]
+
+def _group_by_label(labels, n, rows, cols):
+    """
+    Splits pixel coordinates into one bucket per label (1 to n), without a Python loop over pixels.
+    
+    Steps:
+    1. Sort the coordinates by label (stable, so each bucket keeps raster order).
+    2. Find where each label starts in the sorted labels using `np.searchsorted`.
+    3. Split the sorted (N, 2) coordinate array at those positions and return the n buckets.
+    """
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(2, n + 1))
+    return np.split(_coords_array(rows[order], cols[order]), bounds)
+
+def _coords_array(rows, cols):
+    """
+    Packs row and column indices into an (N, 2) int32 array of (x, y) coordinates.
+    """
+    coords = np.empty((len(rows), 2), dtype=np.int32)
+    coords[:, 0] = rows
+    coords[:, 1] = cols
+    return coords
+
+def _islands_kernel(arr):
+    """
+    Finds pixel islands with an iterative depth-first search that Numba compiles to machine code.
+    
+    Labelling, perimeter detection and coordinate extraction all happen in the same single
+    traversal: each pixel is written straight to the (N, 2) int32 output arrays the islands use.
+    The stack holds flat indices `x * W + y`, so no tuples are allocated.
+    
+    Steps:
+    1. Preallocate the `labels` array (0 means unlabelled), the stack and the output arrays.
+    2. Iterate through each pixel in the image in raster order.
+    3. For each unlabelled pixel with a value less than 1, start a new island:
+       a. Label the pixel and push it onto the stack (pixels are labelled when pushed,
+          so each pixel enters the stack at most once).
+       b. While the stack is not empty, pop a pixel and append its (x, y) coordinates to `pixels`.
+       c. Check its 4 neighbours, written out one after the other rather than as a loop over
+          directions: an out-of-bounds neighbour or one with a value greater than
+          or equal to 1 makes the pixel a perimeter pixel; an unlabelled dark neighbour is
+          labelled and pushed.
+       d. Append perimeter pixels to `perimeter`.
+       e. Record where the island ends in `pixels` and `perimeter` in the offset arrays.
+    4. Return the used part of the pixel and perimeter arrays and their offsets.
+    """
+    H, W = arr.shape
+    labels = np.zeros((H, W), np.int32)
+    stack = np.empty(H * W, np.int64)
+    pixels = np.empty((H * W, 2), np.int32)
+    perimeter = np.empty((H * W, 2), np.int32)
+    # With 4-connectivity there are at most ceil(H * W / 2) islands
+    pixel_offsets = np.zeros((H * W + 1) // 2 + 1, np.int64)
+    perim_offsets = np.zeros((H * W + 1) // 2 + 1, np.int64)
+
+    n = 0
+    num_pixels = 0
+    num_perimeter = 0
+    for i in range(H):
+        for j in range(W):
+            if labels[i, j] != 0 or arr[i, j] >= 1:
+                continue
+            n += 1
+            labels[i, j] = n
+            stack[0] = i * W + j
+            sp = 1
+            while sp > 0:
+                sp -= 1
+                idx = stack[sp]
+                cx = idx // W
+                cy = idx - cx * W
+                pixels[num_pixels, 0] = cx
+                pixels[num_pixels, 1] = cy
+                num_pixels += 1
 
                 is_perimeter = False
-                for dx, dy in directions:
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < len(image) and 0 <= ny < len(image[0]):
-                        if (nx, ny) not in visited:
-                            if image[nx][ny] != pixel_value or image[nx][ny] >= 1:
-                                is_perimeter = True
-                            elif image[nx][ny] == pixel_value:
-                                stack.append((nx, ny))
-                    else:
+                # Up
+                if cx > 0:
+                    if arr[cx - 1, cy] >= 1:
+                        is_perimeter = True
+                    elif labels[cx - 1, cy] == 0:
+                        labels[cx - 1, cy] = n
+                        stack[sp] = idx - W
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Down
+                if cx < H - 1:
+                    if arr[cx + 1, cy] >= 1:
+                        is_perimeter = True
+                    elif labels[cx + 1, cy] == 0:
+                        labels[cx + 1, cy] = n
+                        stack[sp] = idx + W
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Left
+                if cy > 0:
+                    if arr[cx, cy - 1] >= 1:
+                        is_perimeter = True
+                    elif labels[cx, cy - 1] == 0:
+                        labels[cx, cy - 1] = n
+                        stack[sp] = idx - 1
+                        sp += 1
+                else:
+                    is_perimeter = True
+                # Right
+                if cy < W - 1:
+                    if arr[cx, cy + 1] >= 1:
                         is_perimeter = True
+                    elif labels[cx, cy + 1] == 0:
+                        labels[cx, cy + 1] = n
+                        stack[sp] = idx + 1
+                        sp += 1
+                else:
+                    is_perimeter = True
 
                 if is_perimeter:
-                    perimeter.append((cx, cy))
+                    perimeter[num_perimeter, 0] = cx
+                    perimeter[num_perimeter, 1] = cy
+                    num_perimeter += 1
+            pixel_offsets[n] = num_pixels
+            perim_offsets[n] = num_perimeter
 
-    visited = set()
-    islands = []
+    return pixels[:num_pixels], pixel_offsets[:n + 1], perimeter[:num_perimeter], perim_offsets[:n + 1]
 
-    for i in range(len(image)):
-        for j in range(len(image[0])):
-            if (i, j) not in visited and image[i][j] < 1:
-                island = []
-                perimeter = []
-                dfs(i, j, visited, image, island, perimeter)
-                if island:
-                    islands.append({'pixels': island, 'perimeter': perimeter})
+if njit is not None:
+    _islands_kernel = njit(cache=True)(_islands_kernel)
+
+def _islands_from_offsets(pixels, pixel_offsets, perimeter, perim_offsets):
+    """
+    Rebuilds the list of islands from the coordinate arrays returned by a compiled kernel.
+    
+    Steps:
+    1. Split the (N, 2) pixel and perimeter coordinate arrays at the island offsets (as views).
+    2. Build one island per pair of slices and return the list of islands.
+    """
+    if len(pixels) == 0:
+        return []
 
-    return islands
+    pixels = np.split(pixels, pixel_offsets[1:-1])
+    perimeters = np.split(perimeter, perim_offsets[1:-1])
+    return [{'pixels': p, 'perimeter': q} for p, q in zip(pixels, perimeters)]
+
+def _find_islands_sparse(dark, width):
+    """
+    Identifies pixel islands from the flat indices of the dark pixels only, for mostly-background
+    images, so the work and memory grow with the number of dark pixels rather than the image area.
+    
+    Steps:
+    1. Find the right and lower neighbour of every dark pixel among the dark pixels: the right
+       neighbour is the next dark pixel when it is adjacent and on the same row, the lower one is
+       found by bisecting the sorted indices with `np.searchsorted`.
+    2. Join each pixel with those neighbours using `_union_find_kernel`.
+    3. Number the resulting sets 1 to n in the raster order of their first pixel.
+    4. Find the perimeter pixels: those missing a dark neighbour above, below, left or right
+       (a neighbour across the image border never counts).
+    5. Bucket the pixel and perimeter coordinates by label using `_group_by_label` and return the list of islands.
+    """
+    m = len(dark)
+    if m == 0:
+        return []
+
+    idx = np.arange(m)
+    cols = dark % width
+    has_right = np.zeros(m, dtype=bool)
+    has_right[:-1] = (dark[1:] == dark[:-1] + 1) & (cols[:-1] != width - 1)
+    has_left = np.zeros(m, dtype=bool)
+    has_left[1:] = has_right[:-1]
+    below = np.minimum(np.searchsorted(dark, dark + width), m - 1)
+    has_below = dark[below] == dark + width
+    above = np.searchsorted(dark, dark - width)
+    has_above = dark[np.minimum(above, m - 1)] == dark - width
+
+    first = np.concatenate((idx[has_right], idx[has_below]))
+    second = np.concatenate((idx[has_right] + 1, below[has_below]))
+    roots = _union_find_kernel(first, second, m)
+
+    _, first_seen, inverse = np.unique(roots, return_index=True, return_inverse=True)
+    n = len(first_seen)
+    relabel = np.empty(n, dtype=np.int64)
+    relabel[np.argsort(first_seen)] = np.arange(1, n + 1)
+    labels = relabel[inverse]
+
+    edge = ~(has_left & has_right & has_above & has_below)
+    rows = dark // width
+    pixels = _group_by_label(labels, n, rows, cols)
+    perimeters = _group_by_label(labels[edge], n, rows[edge], cols[edge])
+    return [{'pixels': p, 'perimeter': q} for p, q in zip(pixels, perimeters)]
+
+def _find_root(parent, k):
+    """
+    Returns the root of k's set, halving the path to it on the way.
+    """
+    while parent[k] != k:
+        parent[k] = parent[parent[k]]
+        k = parent[k]
+    return k
+
+def _union_find_kernel(first, second, m):
+    """
+    Weighted union-find with path halving over m elements, compiled by Numba.
+    
+    Steps:
+    1. Start with every element in its own set, with rank 0.
+    2. For each pair (first[e], second[e]), join the two sets by attaching the root of lower
+       rank under the root of higher rank.
+    3. Return the root of every element.
+    """
+    parent = np.arange(m)
+    rank = np.zeros(m, np.int8)
+    for e in range(len(first)):
+        a = _find_root(parent, first[e])
+        b = _find_root(parent, second[e])
+        if a == b:
+            continue
+        if rank[a] < rank[b]:
+            a, b = b, a
+        parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+
+    roots = np.empty(m, np.int64)
+    for k in range(m):
+        roots[k] = _find_root(parent, k)
+    return roots
+
+if njit is not None:
+    _find_root = njit(cache=True)(_find_root)
+    _union_find_kernel = njit(cache=True)(_union_find_kernel)
+
+def _find_islands_dfs(arr):
+    """
+    Identifies pixel islands in a grayscale image without SciPy or Numba.
+    
+    The search is a scanline flood fill over horizontal runs of pixels with a value less than 1,
+    so the Python loop runs once per run instead of once per pixel.
+    
+    Steps:
+    1. Build a boolean mask of the pixels with a value less than 1.
+    2. Find the row, start column and end column (exclusive) of every run of the mask in one
+       vectorized pass, in raster order, and where the runs of each row begin (`row_offsets`).
+    3. Initialize a compact int32 array `run_labels` with one label per run (0 means not visited yet).
+    4. Iterate through each run, and for each run that hasn't been visited call `dfs` to flood
+       fill the entire island starting from this run with a new label.
+    5. Paint the run labels into a label array (the mask pixels are in the same raster order as the runs).
+    6. Convert the label array and the `_perimeter_mask` of the mask to the list of islands
+       using `_islands_from_labels`.
+    """
+    H = arr.shape[0]
+
+    def dfs(k, n, run_labels, H=H):
+        """
+        Performs a scanline flood fill to identify all connected runs in an island.
+        
+        Steps:
+        1. Initialize a stack with the starting run k.
+        2. While the stack is not empty (the image height H is bound as a default argument,
+           so it is a fast local lookup):
+           a. Pop the top run from the stack and get its row cx and columns [start, end).
+           b. If this run has not been visited:
+              i. Label it with the island number n.
+              ii. For the rows above and below (when within the image bounds), push every run
+                  overlapping [start, end), found by bisecting that row's run starts and ends.
+        """
+        stack = [k]
+
+        while stack:
+            k = stack.pop()
+            if not run_labels[k]:
+                run_labels[k] = n
+                cx, start, end = rows[k], starts[k], ends[k]
+                for nx in (cx - 1, cx + 1):
+                    if 0 <= nx < H:
+                        lo = bisect_right(ends, start, row_offsets[nx], row_offsets[nx + 1])
+                        hi = bisect_left(starts, end, lo, row_offsets[nx + 1])
+                        stack.extend(range(lo, hi))
+
+    mask = arr < 1
+    # +1 where a run starts and -1 one past where it ends
+    steps = np.diff(np.pad(mask, ((0, 0), (1, 1))).view(np.int8), axis=1)
+    run_rows, run_starts = np.nonzero(steps == 1)
+    run_ends = np.nonzero(steps == -1)[1]
+    row_offsets = np.searchsorted(run_rows, np.arange(H + 1)).tolist()
+    rows, starts, ends = run_rows.tolist(), run_starts.tolist(), run_ends.tolist()
+
+    run_labels = array('i', bytes(4 * len(starts)))  # int32, zero-filled
+    n = 0
+    for k in range(len(starts)):
+        if not run_labels[k]:
+            n += 1
+            dfs(k, n, run_labels)
+
+    lbl = np.zeros(arr.shape, dtype=np.int32)
+    lbl[mask] = np.repeat(run_labels, run_ends - run_starts)
+    return _islands_from_labels(lbl, n, _perimeter_mask(mask))
 
 def load_image(file_path):
     """
@@ -86,62 +407,91 @@ def load_image(file_path):
     
     Steps:
     1. Open the image file using PIL's Image.open.
-    2. Convert the image to grayscale using convert('L').
-    3. Get the pixel data as a flat list using getdata().
-    4. Get the width and height of the image.
-    5. Reshape the flat list of pixels into a 2D list (height x width).
-    6. Return the grayscale image (PIL image object) and the 2D list of pixel values.
+    2. Convert the image to grayscale using convert('L'), unless it already is grayscale
+       (converting an 'L' image would only make a full copy of it).
+    3. Get the pixel data as a 2D uint8 NumPy array (height x width) through the array
+       interface, without going through a Python list of pixels.
+    4. Return the array of pixel values.
     """
     img = Image.open(file_path)
-    img = img.convert('L')  # Convert image to grayscale
-    pixels = list(img.getdata())
-    width, height = img.size
-    image = [pixels[i * width:(i + 1) * width] for i in range(height)]
-    return img, image
+    if img.mode != 'L':
+        img = img.convert('L')  # Convert image to grayscale
+    return np.asarray(img, dtype=np.uint8)
 
-def save_image_with_islands(image, islands, output_path):
+def save_image_with_islands(arr, islands, output_path):
     """
     Saves an image with identified islands highlighted in red.
     
     Steps:
-    1. Convert the grayscale image to RGB to modify colors.
-    2. Load the pixel data for the image.
-    3. For each island in the list of islands:
-       a. For each pixel in the island:
-          i. Change the pixel's color to red (255, 0, 0).
-    4. Save the modified image to the specified output path.
+    1. Repeat the grayscale array into a (height, width, 3) RGB array, without going back through PIL.
+    2. Stack the (N, 2) pixel coordinate arrays of all islands.
+    3. Change the color of every island pixel to red (255, 0, 0) in a single fancy-indexed assignment.
+    4. Save the modified image to the specified output path, with fast (level 1) PNG compression.
     """
-    image = image.convert('RGB')
-    pixels = image.load()
+    rgb = np.repeat(arr[:, :, None], 3, axis=2)
 
-    for island in islands:
-        for y, x in island['pixels']:  # Note: coordinates are (y, x) in the island
-            pixels[x, y] = (255, 0, 0)  # Set pixel to red
+    if islands:
+        # Note: coordinates are (row, column) in the island
+        coords = np.concatenate([island['pixels'] for island in islands])
+        rgb[coords[:, 0], coords[:, 1]] = (255, 0, 0)  # Set pixels to red
 
-    image.save(output_path)
+    Image.fromarray(rgb).save(output_path, compress_level=1)
 
 def save_islands_to_spreadsheet(islands, output_path):
     """
-    Saves the details of identified islands to an Excel spreadsheet.
+    Saves a summary of the identified islands to an Excel spreadsheet.
+    
+    The coordinates themselves are saved to Parquet by `save_islands_to_parquet`, which is much
+    faster than writing them to Excel, so the spreadsheet stays small.
     
     Steps:
-    1. Initialize an empty list `data` to store the information for each island.
-    2. For each island in the list of islands:
-       a. Get the number of pixels in the island.
-       b. Format the coordinates of the pixels and the perimeter pixels as strings.
-       c. Append the island's information (number, pixel coordinates, perimeter coordinates) to the `data` list.
-    3. Create a DataFrame from the `data` list with appropriate column names.
-    4. Save the DataFrame to an Excel file at the specified output path.
-    """
-    data = []
-    for idx, island in enumerate(islands):
-        num_pixels = len(island['pixels'])
-        pixel_coords = '; '.join([f"({x}, {y})" for x, y in island['pixels']])
-        perimeter_coords = '; '.join([f"({x}, {y})" for x, y in island['perimeter']])
-        data.append([idx + 1, num_pixels, pixel_coords, perimeter_coords])
-
-    df = pd.DataFrame(data, columns=['Island Number', 'Number of Pixels', 'Pixel Coordinates', 'Perimeter Coordinates'])
-    df.to_excel(output_path, index=False)
+    1. Count the pixels and perimeter pixels of each island.
+    2. Create a DataFrame with the island number and the two counts.
+    3. Write it to the 'Islands' sheet using the XlsxWriter engine, in chunks of at most
+       `_EXCEL_MAX_ROWS` rows, continuing on extra sheets named 'Islands (2)', 'Islands (3)', ...
+       when a sheet is full.
+    """
+    num_pixels = np.array([len(island['pixels']) for island in islands], dtype=np.int64)
+    num_perimeter = np.array([len(island['perimeter']) for island in islands], dtype=np.int64)
+    df = pd.DataFrame({
+        'Island Number': np.arange(1, len(islands) + 1),
+        'Number of Pixels': num_pixels,
+        'Number of Perimeter Pixels': num_perimeter,
+    })
+
+    with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
+        for part, start in enumerate(range(0, max(len(df), 1), _EXCEL_MAX_ROWS)):
+            name = 'Islands' if part == 0 else f"Islands ({part + 1})"
+            df.iloc[start:start + _EXCEL_MAX_ROWS].to_excel(writer, sheet_name=name, index=False)
+
+def save_islands_to_parquet(islands, output_path):
+    """
+    Saves the coordinates of every island pixel to a Parquet file, one row per pixel.
+    
+    Steps:
+    1. Stack the pixel coordinates of all islands into one (N, 2) array.
+    2. Repeat each island number once per pixel using `np.repeat`.
+    3. Flag the perimeter pixels by matching them against the pixels with `np.isin`
+       (each coordinate is packed into a single int64 key first).
+    4. Write the island, x, y and is_perimeter columns with pyarrow, zstd compressed.
+    """
+    counts = np.array([len(island['pixels']) for island in islands], dtype=np.int64)
+    if islands:
+        coords = np.concatenate([island['pixels'] for island in islands]).astype(np.int64)
+        perimeter = np.concatenate([island['perimeter'] for island in islands]).astype(np.int64)
+    else:
+        coords = perimeter = np.empty((0, 2), dtype=np.int64)
+
+    width = coords[:, 1].max() + 1 if len(coords) else 1
+    is_perimeter = np.isin(coords[:, 0] * width + coords[:, 1], perimeter[:, 0] * width + perimeter[:, 1])
+
+    table = pa.table({
+        'island': np.repeat(np.arange(1, len(islands) + 1, dtype=np.int32), counts),
+        'x': coords[:, 0].astype(np.int32),
+        'y': coords[:, 1].astype(np.int32),
+        'is_perimeter': is_perimeter,
+    })
+    pq.write_table(table, output_path, compression='zstd')
 
 def generate_output_paths(input_path):
     """
@@ -151,55 +501,64 @@ def generate_output_paths(input_path):
     1. Extract the base name of the input file (without extension).
     2. Append '_islands.png' to the base name for the output image path.
     3. Append '_islands.xlsx' to the base name for the output Excel path.
-    4. Return the generated output image path and output Excel path.
+    4. Append '_islands.parquet' to the base name for the output Parquet path.
+    5. Return the generated output image path, output Excel path and output Parquet path.
     """
     base_name = os.path.splitext(os.path.basename(input_path))[0]
     output_image_path = f"{base_name}_islands.png"
     output_excel_path = f"{base_name}_islands.xlsx"
-    return output_image_path, output_excel_path
+    output_parquet_path = f"{base_name}_islands.parquet"
+    return output_image_path, output_excel_path, output_parquet_path
 
 def main():
     """
     Main function to process the input image file, identify pixel islands,
-    and save the results to an output image and an Excel spreadsheet.
+    and save the results to an output image, an Excel spreadsheet and a Parquet file.
     
     Steps:
     1. Parse the command line arguments to get the input file path.
-    2. Generate output file paths for the image and Excel file.
+    2. Generate output file paths for the image, Excel file and Parquet file.
     3. Check if output files already exist and prompt for overwrite confirmation if they do.
-    4. Load the image and convert it to a grayscale 2D list.
+    4. Load the image and convert it to a grayscale 2D array.
     5. Identify pixel islands in the image.
-    6. Save the image with islands highlighted to the output image path.
-    7. Save the island details to an Excel spreadsheet at the output Excel path.
-    8. Print the number of islands found and the paths of the output files.
+    6. Concurrently, on three threads:
+       a. Save the image with islands highlighted to the output image path.
+       b. Save the island summary to an Excel spreadsheet at the output Excel path.
+       c. Save the island coordinates to a Parquet file at the output Parquet path.
+    7. Print the number of islands found and the paths of the output files.
     """
     parser = argparse.ArgumentParser(description="Find pixel islands in an image file (supports multiple formats).")
     parser.add_argument('file_path', type=str, help="Path to the image file (e.g., BMP, TIFF, PNG, JPEG).")
     args = parser.parse_args()
 
-    output_image_path, output_excel_path = generate_output_paths(args.file_path)
+    output_image_path, output_excel_path, output_parquet_path = generate_output_paths(args.file_path)
 
     # Check if output files already exist and prompt for overwrite
-    for path in [output_image_path, output_excel_path]:
+    for path in [output_image_path, output_excel_path, output_parquet_path]:
         if os.path.exists(path):
             overwrite = input(f"{path} already exists. Do you want to overwrite it? (y/n): ")
             if overwrite.lower() != 'y':
                 print("Operation cancelled.")
                 return
 
-    img, image = load_image(args.file_path)
-    islands = find_islands(image)
+    arr = load_image(args.file_path)
+    islands = find_islands(arr)
 
-    # Save image with islands highlighted
-    save_image_with_islands(img, islands, output_image_path)
-    
-    # Save islands to spreadsheet
-    save_islands_to_spreadsheet(islands, output_excel_path)
+    # Save image with islands highlighted, islands to spreadsheet and coordinates to Parquet
+    # at the same time (the PNG, ZIP and zstd compression all release the GIL)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        image_future = executor.submit(save_image_with_islands, arr, islands, output_image_path)
+        excel_future = executor.submit(save_islands_to_spreadsheet, islands, output_excel_path)
+        parquet_future = executor.submit(save_islands_to_parquet, islands, output_parquet_path)
+        image_future.result()
+        excel_future.result()
+        parquet_future.result()
     
     # Print final message
     print(f"Found {len(islands)} islands :)")
     print(f"Output image saved to {output_image_path}")
     print(f"Output spreadsheet saved to {output_excel_path}")
+    print(f"Output coordinates saved to {output_parquet_path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,13 @@
+"""
+Builds the optional compiled island search used by bad_pixels.py:
+
+    python setup.py build_ext --inplace
+"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    ext_modules=cythonize([
+        Extension('_islands', ['_islands.pyx'], extra_compile_args=['-O3', '-march=native']),
+    ]),
+)